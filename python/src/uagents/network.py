@@ -2,7 +2,10 @@
 
 import asyncio
 import time
-from datetime import datetime, timedelta
+import weakref
+from datetime import timedelta
+from functools import lru_cache
+from itertools import chain
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 from cosmpy.aerial.client import (
@@ -43,6 +46,19 @@ _faucet_api = FaucetApi(NetworkConfig.fetchai_stable_testnet())
 _testnet_ledger = LedgerClient(NetworkConfig.fetchai_stable_testnet())
 _mainnet_ledger = LedgerClient(NetworkConfig.fetchai_mainnet())
 
+_ledger_networks: "weakref.WeakKeyDictionary[LedgerClient, AgentNetwork]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_VERSION_CHECK_TTL = 300
+_version_check_cache: Dict[str, Tuple[float, bool]] = {}
+
+_PRICE_PER_SECOND_TTL = 60
+_price_per_second_cache: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+
+_MIN_TX_POLL_INTERVAL_SECS = 0.2
+_TX_POLL_BACKOFF_FACTOR = 1.5
+
 
 class InsufficientFundsError(Exception):
     """Raised when an agent has insufficient funds for a transaction."""
@@ -76,6 +92,30 @@ def get_ledger(network: AgentNetwork = "testnet") -> LedgerClient:
     return _testnet_ledger
 
 
+def _network_for(ledger: LedgerClient) -> AgentNetwork:
+    """
+    Get the network the Ledger client is connected to.
+
+    The chain id is only queried once per client.
+
+    Args:
+        ledger (LedgerClient): The Ledger client.
+
+    Returns:
+        AgentNetwork: "mainnet" if the client is connected to the mainnet, "testnet" otherwise.
+    """
+    network = _ledger_networks.get(ledger)
+    if network is None:
+        chain_id = ledger.query_chain_id()
+        network = (
+            "mainnet"
+            if chain_id == NetworkConfig.fetchai_mainnet().chain_id
+            else "testnet"
+        )
+        _ledger_networks[ledger] = network
+    return network
+
+
 def get_faucet() -> FaucetApi:
     """
     Get the Faucet API instance.
@@ -121,6 +161,26 @@ def parse_record_config(
     return records
 
 
+# keyed by every (field, value) pair of AgentEndpoint, so fields added to the model
+# are part of the key and of the dump; the cached dicts are shared and never returned
+@lru_cache(maxsize=256)
+def _dump_endpoint_fields(fields: Tuple[Tuple[str, Any], ...]) -> Dict[str, Any]:
+    return AgentEndpoint.model_validate(dict(fields)).model_dump()
+
+
+def _dump_endpoint(endpoint: AgentEndpoint) -> Dict[str, Any]:
+    """
+    Serialize an agent endpoint for a registration message.
+
+    Args:
+        endpoint (AgentEndpoint): The endpoint to serialize.
+
+    Returns:
+        Dict[str, Any]: A copy of the serialized endpoint that is safe to modify.
+    """
+    return dict(_dump_endpoint_fields(tuple(endpoint)))
+
+
 async def wait_for_tx_to_complete(
     tx_hash: str,
     ledger: LedgerClient,
@@ -135,7 +195,8 @@ async def wait_for_tx_to_complete(
         ledger (LedgerClient): The Ledger client to poll.
         timeout (Optional[timedelta], optional): The maximum time to wait.
         the transaction to complete. Defaults to None.
-        poll_period (Optional[timedelta], optional): The time interval to poll
+        poll_period (Optional[timedelta], optional): The maximum time interval to poll.
+        Polling starts at a shorter interval and backs off up to this period.
 
     Returns:
         TxResponse: The response object containing the transaction details.
@@ -144,18 +205,21 @@ async def wait_for_tx_to_complete(
         timeout = timedelta(seconds=DEFAULT_QUERY_TIMEOUT_SECS)
     if poll_period is None:
         poll_period = timedelta(seconds=DEFAULT_QUERY_INTERVAL_SECS)
-    start = datetime.now()
+    poll_sec = poll_period.total_seconds()
+    sleep_sec = min(poll_sec, max(_MIN_TX_POLL_INTERVAL_SECS, poll_sec / 4))
+    deadline = time.monotonic() + timeout.total_seconds()
     while True:
         try:
             return ledger.query_tx(tx_hash)
         except NotFoundError:
             pass
 
-        delta = datetime.now() - start
-        if delta >= timeout:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
             raise QueryTimeoutError()
 
-        await asyncio.sleep(poll_period.total_seconds())
+        await asyncio.sleep(min(sleep_sec, remaining))
+        sleep_sec = min(poll_sec, sleep_sec * _TX_POLL_BACKOFF_FACTOR)
 
 
 class AlmanacContract(LedgerContract):
@@ -172,25 +236,36 @@ class AlmanacContract(LedgerContract):
         Check if the contract version supported by this version of uAgents matches the
         deployed version.
 
+        The result is cached per contract address for a short period to avoid
+        querying the ledger on every call.
+
         Returns:
             bool: True if the contract version is supported, False otherwise.
         """
+        key = str(self.address)
+        cached = _version_check_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < _VERSION_CHECK_TTL:
+            return cached[1]
+
         try:
             deployed_version = self.get_contract_version()
-            if deployed_version != ALMANAC_CONTRACT_VERSION:
-                logger.warning(
-                    f"The deployed version of the Almanac Contract is {deployed_version} "
-                    f"and you are using version {ALMANAC_CONTRACT_VERSION}. "
-                    "Update uAgents to the latest version to enable contract interactions.",
-                )
-                return False
         except Exception as e:
+            _version_check_cache.pop(key, None)
             logger.error(
                 "Failed to query contract version. Contract interactions will be disabled."
             )
             logger.debug(e)
             return False
-        return True
+
+        supported = deployed_version == ALMANAC_CONTRACT_VERSION
+        if not supported:
+            logger.warning(
+                f"The deployed version of the Almanac Contract is {deployed_version} "
+                f"and you are using version {ALMANAC_CONTRACT_VERSION}. "
+                "Update uAgents to the latest version to enable contract interactions.",
+            )
+        _version_check_cache[key] = (time.monotonic(), supported)
+        return supported
 
     def query_contract(self, query_msg: Dict[str, Any]) -> Any:
         """
@@ -237,8 +312,7 @@ class AlmanacContract(LedgerContract):
         Returns:
             bool: True if the agent is registered, False otherwise.
         """
-        query_msg = {"query_records": {"agent_address": address}}
-        response = self.query_contract(query_msg)
+        response = self._fetch_record(address)
 
         return bool(response.get("record"))
 
@@ -262,16 +336,32 @@ class AlmanacContract(LedgerContract):
             bool: True if the agent's registration needs to be updated or will expire sooner
             than the specified minimum time, False otherwise.
         """
+        response = self._fetch_record(address)
+        if not response.get("record"):
+            return True
+
         seconds_to_expiry, registered_endpoints, registered_protocols = (
-            self.query_agent_record(address)
+            self._parse_record(response)
         )
         return (
-            not self.is_registered(address)
-            or seconds_to_expiry < min_seconds_left
+            seconds_to_expiry < min_seconds_left
             or endpoints != registered_endpoints
             or protocols != registered_protocols
         )
 
+    def _fetch_record(self, address: str) -> Dict[str, Any]:
+        """
+        Query the raw record of an agent's registration.
+
+        Args:
+            address (str): The agent's address.
+
+        Returns:
+            Dict[str, Any]: The query response containing the agent's record.
+        """
+        query_msg = {"query_records": {"agent_address": address}}
+        return self.query_contract(query_msg)
+
     def query_agent_record(
         self, address: str
     ) -> Tuple[int, List[AgentEndpoint], List[str]]:
@@ -283,29 +373,39 @@ class AlmanacContract(LedgerContract):
 
         Returns:
             Tuple[int, List[AgentEndpoint], List[str]]: The expiry height of the agent's
-            registration, the agent's endpoints, and the agent's protocols.
+            registration, the agent's endpoints, and the agent's protocols. If the agent
+            is not registered, this is (0, [], []).
         """
-        query_msg = {"query_records": {"agent_address": address}}
-        response = self.query_contract(query_msg)
+        response = self._fetch_record(address)
 
         if not response.get("record"):
-            return []
+            return 0, [], []
 
-        if not response.get("record"):
-            contract_state = self.query_contract({"query_contract_state": {}})
-            expiry = contract_state.get("state", {}).get("expiry_height", 0)
-            return expiry * AVERAGE_BLOCK_INTERVAL
+        return self._parse_record(response)
+
+    @staticmethod
+    def _parse_record(
+        response: Dict[str, Any],
+    ) -> Tuple[int, List[AgentEndpoint], List[str]]:
+        """
+        Parse the expiry, endpoints and protocols out of a record query response.
+
+        Args:
+            response (Dict[str, Any]): The response of a non-empty record query.
 
-        expiry_block = response["record"][0].get("expiry", 0)
+        Returns:
+            Tuple[int, List[AgentEndpoint], List[str]]: The seconds to expiry of the
+            agent's registration, the agent's endpoints, and the agent's protocols.
+        """
+        record = response["record"][0]
+        expiry_block = record.get("expiry", 0)
         current_block = response.get("height", 0)
 
         seconds_to_expiry = (expiry_block - current_block) * AVERAGE_BLOCK_INTERVAL
 
-        endpoints = []
-        for endpoint in response["record"][0]["record"]["service"]["endpoints"]:
-            endpoints.append(AgentEndpoint.model_validate(endpoint))
-
-        protocols = response["record"][0]["record"]["service"]["protocols"]
+        service = record["record"]["service"]
+        endpoints = [AgentEndpoint.model_validate(e) for e in service["endpoints"]]
+        protocols = service["protocols"]
 
         return seconds_to_expiry, endpoints, protocols
 
@@ -358,7 +458,7 @@ class AlmanacContract(LedgerContract):
                 "record": {
                     "service": {
                         "protocols": protocols,
-                        "endpoints": [e.model_dump() for e in endpoints],
+                        "endpoints": [_dump_endpoint(e) for e in endpoints],
                     }
                 },
                 "signature": signature,
@@ -411,8 +511,8 @@ class AlmanacContract(LedgerContract):
             )
         )
 
-        transaction = prepare_and_broadcast_basic_transaction(
-            ledger, transaction, wallet
+        transaction = await asyncio.to_thread(
+            prepare_and_broadcast_basic_transaction, ledger, transaction, wallet
         )
         timeout = timedelta(seconds=DEFAULT_LEDGER_TX_WAIT_SECONDS)
         await wait_for_tx_to_complete(transaction.tx_hash, ledger, timeout=timeout)
@@ -434,15 +534,20 @@ class AlmanacContract(LedgerContract):
         if not self.address:
             raise ValueError("Contract address not set")
 
+        unsigned = [
+            i
+            for i, record in enumerate(agent_records)
+            if record.timestamp is None or record.signature is None
+        ]
+        if unsigned:
+            raise ValueError(f"Agent records {unsigned} are not signed")
+
         transaction = Transaction()
+        denom = self._client.network_config.fee_denomination
+        funds = f"{REGISTRATION_FEE}{denom}"
+        wallet_address = wallet.address()
 
         for record in agent_records:
-            if record.timestamp is None:
-                raise ValueError("Agent record is missing timestamp")
-
-            if record.signature is None:
-                raise ValueError("Agent record is not signed")
-
             almanac_msg = self.get_registration_msg(
                 protocols=record.protocols,
                 endpoints=record.endpoints,
@@ -451,18 +556,17 @@ class AlmanacContract(LedgerContract):
                 address=record.address,
             )
 
-            denom = self._client.network_config.fee_denomination
             transaction.add_message(
                 create_cosmwasm_execute_msg(
-                    wallet.address(),
+                    wallet_address,
                     self.address,
                     almanac_msg,
-                    funds=f"{REGISTRATION_FEE}{denom}",
+                    funds=funds,
                 )
             )
 
-        transaction = prepare_and_broadcast_basic_transaction(
-            ledger, transaction, wallet
+        transaction = await asyncio.to_thread(
+            prepare_and_broadcast_basic_transaction, ledger, transaction, wallet
         )
         timeout = timedelta(seconds=DEFAULT_LEDGER_TX_WAIT_SECONDS)
         await wait_for_tx_to_complete(transaction.tx_hash, ledger, timeout=timeout)
@@ -510,6 +614,10 @@ def get_almanac_contract(
     return None
 
 
+_mainnet_name_service_address = Address(MAINNET_CONTRACT_NAME_SERVICE)
+_testnet_name_service_address = Address(TESTNET_CONTRACT_NAME_SERVICE)
+
+
 class NameServiceContract(LedgerContract):
     """
     A class representing the NameService contract for managing domain names and ownership.
@@ -612,7 +720,35 @@ class NameServiceContract(LedgerContract):
             return result["record"]["records"][0]["agent_address"]["records"]
         return []
 
-    def get_registration_tx(
+    def _get_cached_price_per_second(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the recently queried registration price of the contract, if any.
+
+        Returns:
+            Optional[Dict[str, Any]]: The price per second, or None if it is not cached.
+        """
+        cached = _price_per_second_cache.get(str(self.address))
+        if cached is not None and time.monotonic() - cached[0] < _PRICE_PER_SECOND_TTL:
+            return cached[1]
+        return None
+
+    def _query_price_per_second(self) -> Dict[str, Any]:
+        """
+        Query the registration price of the contract and cache it.
+
+        Returns:
+            Dict[str, Any]: The price per second, with its amount and denomination.
+        """
+        price_per_second = self.query_contract({"query_contract_state": {}})[
+            "price_per_second"
+        ]
+        _price_per_second_cache[str(self.address)] = (
+            time.monotonic(),
+            price_per_second,
+        )
+        return price_per_second
+
+    async def get_registration_tx(
         self,
         name: str,
         wallet_address: Address,
@@ -636,16 +772,29 @@ class NameServiceContract(LedgerContract):
         """
         transaction = Transaction()
 
-        contract = Address(
-            MAINNET_CONTRACT_NAME_SERVICE
+        contract = (
+            _mainnet_name_service_address
             if network == "mainnet"
-            else TESTNET_CONTRACT_NAME_SERVICE
+            else _testnet_name_service_address
         )
 
-        if self.is_name_available(name, domain):
-            price_per_second = self.query_contract({"query_contract_state": {}})[
-                "price_per_second"
-            ]
+        price_per_second = self._get_cached_price_per_second()
+        if price_per_second is None:
+            # the price is only needed for new names, so a failed price query must not
+            # abort an update by the current owner
+            is_available, price_per_second = await asyncio.gather(
+                asyncio.to_thread(self.is_name_available, name, domain),
+                asyncio.to_thread(self._query_price_per_second),
+                return_exceptions=True,
+            )
+            if isinstance(is_available, BaseException):
+                raise is_available
+        else:
+            is_available = await asyncio.to_thread(self.is_name_available, name, domain)
+
+        if is_available:
+            if isinstance(price_per_second, BaseException):
+                raise price_per_second
             amount = int(price_per_second["amount"]) * 86400
             denom = price_per_second["denom"]
 
@@ -656,7 +805,9 @@ class NameServiceContract(LedgerContract):
                     wallet_address, contract, registration_msg, funds=f"{amount}{denom}"
                 )
             )
-        elif not self.is_owner(name, domain, str(wallet_address)):
+        elif not await asyncio.to_thread(
+            self.is_owner, name, domain, str(wallet_address)
+        ):
             return None
 
         record_msg = {
@@ -695,22 +846,29 @@ class NameServiceContract(LedgerContract):
                 appended to the previous records. Defaults to True.
         """
         logger.info("Registering name...")
-        chain_id = ledger.query_chain_id()
-        network = (
-            "mainnet"
-            if chain_id == NetworkConfig.fetchai_mainnet().chain_id
-            else "testnet"
-        )
+        network = await asyncio.to_thread(_network_for, ledger)
 
         records = parse_record_config(agent_records)
         if not records:
             raise ValueError("Invalid record configuration")
         agent_addresses = [val.get("address") for val in records]
 
-        for agent_address in agent_addresses:
-            if not get_almanac_contract(network).is_registered(
-                agent_address  # type: ignore
-            ):
+        almanac_contract = get_almanac_contract(network)
+        if almanac_contract is None:
+            logger.warning(
+                "Almanac contract is not available, unable to verify agent registrations."
+            )
+            return
+
+        registered = await asyncio.gather(
+            *[
+                asyncio.to_thread(almanac_contract.is_registered, agent_address)
+                for agent_address in agent_addresses
+            ]
+        )
+        # zip(strict=...) requires Python 3.10; gather returns one result per address
+        for agent_address, is_registered in zip(agent_addresses, registered):  # noqa: B905
+            if not is_registered:
                 logger.warning(
                     "Address %s needs to be registered in almanac contract "
                     "to be registered in a domain.",
@@ -728,12 +886,12 @@ class NameServiceContract(LedgerContract):
             previous_records = self.get_previous_records(name, domain)
             records = list(
                 {
-                    f"{rec['address']}_{rec['weight']}": rec
-                    for rec in previous_records + records
+                    (rec["address"], rec["weight"]): rec
+                    for rec in chain(previous_records, records)
                 }.values()
             )
 
-        transaction = self.get_registration_tx(
+        transaction = await self.get_registration_tx(
             name,
             wallet.address(),
             records,
@@ -746,12 +904,22 @@ class NameServiceContract(LedgerContract):
                 f"Please select another name, {name} is owned by another address"
             )
             return
-        transaction = prepare_and_broadcast_basic_transaction(
-            ledger, transaction, wallet
+        transaction = await asyncio.to_thread(
+            prepare_and_broadcast_basic_transaction, ledger, transaction, wallet
         )
         await wait_for_tx_to_complete(transaction.tx_hash, ledger)
         logger.info("Registering name...complete")
 
+    def _execute_and_wait(self, msg: Dict[str, Any], wallet: LocalWallet):
+        """
+        Execute a message on the contract and wait for the transaction to complete.
+
+        Args:
+            msg (Dict[str, Any]): The execute message.
+            wallet (LocalWallet): The wallet sending the transaction.
+        """
+        self.execute(msg, wallet).wait_to_complete()
+
     async def unregister(
         self,
         name: str,
@@ -777,16 +945,16 @@ class NameServiceContract(LedgerContract):
                 "domain": f"{name}.{domain}",
             }
         }
-        self.execute(msg, wallet).wait_to_complete()
+        await asyncio.to_thread(self._execute_and_wait, msg, wallet)
 
         logger.info("Unregistering name...complete")
 
 
 _mainnet_name_service_contract = NameServiceContract(
-    None, _mainnet_ledger, Address(MAINNET_CONTRACT_NAME_SERVICE)
+    None, _mainnet_ledger, _mainnet_name_service_address
 )
 _testnet_name_service_contract = NameServiceContract(
-    None, _testnet_ledger, Address(TESTNET_CONTRACT_NAME_SERVICE)
+    None, _testnet_ledger, _testnet_name_service_address
 )
 
 
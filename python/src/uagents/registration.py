@@ -284,12 +284,11 @@ class LedgerBasedRegistrationPolicy(AgentRegistrationPolicy):
 
         _, _, agent_address = parse_identifier(agent_identifier)
 
-        if (
-            not self._almanac_contract.is_registered(agent_address)
-            or self._almanac_contract.get_expiry(agent_address)
-            < REGISTRATION_UPDATE_INTERVAL_SECONDS
-            or endpoints != self._almanac_contract.get_endpoints(agent_address)
-            or protocols != self._almanac_contract.get_protocols(agent_address)
+        if self._almanac_contract.registration_needs_update(
+            agent_address,
+            endpoints,
+            protocols,
+            REGISTRATION_UPDATE_INTERVAL_SECONDS,
         ):
             if self._get_balance() < REGISTRATION_FEE:
                 self._logger.warning(
@@ -365,6 +364,8 @@ class BatchLedgerRegistrationPolicy(BatchRegistrationPolicy):
         self._logger = logger or logging.getLogger(__name__)
         self._records: List[AlmanacContractRecord] = []
         self._identities: Dict[str, Identity] = {}
+        self._contract_address = str(almanac_contract.address)
+        self._sender_address = str(wallet.address())
 
     def add_agent(self, agent_info: AgentInfo, identity: Identity):
         agent_record = AlmanacContractRecord(
@@ -372,8 +373,8 @@ class BatchLedgerRegistrationPolicy(BatchRegistrationPolicy):
             prefix=agent_info.prefix,
             protocols=agent_info.protocols,
             endpoints=agent_info.endpoints,
-            contract_address=str(self._almanac_contract.address),
-            sender_address=str(self._wallet.address()),
+            contract_address=self._contract_address,
+            sender_address=self._sender_address,
         )
         self._records.append(agent_record)
         self._identities[agent_info.address] = identity
@@ -141,7 +141,7 @@ class TestRegistration(unittest.IsolatedAsyncioTestCase):
         if not name_service_contract.address:
             self.fail("Name service contract address is invalid")
 
-        tx = name_service_contract.get_registration_tx(
+        tx = await name_service_contract.get_registration_tx(
             agent.name, agent.wallet.address(), agent.address, "example.agent", True
         )
 
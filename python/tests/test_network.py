@@ -0,0 +1,368 @@
+# pylint: disable=protected-access
+import gc
+import unittest
+import weakref
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from cosmpy.aerial.client import NetworkConfig
+from cosmpy.aerial.exceptions import NotFoundError, QueryTimeoutError
+from cosmpy.aerial.wallet import LocalWallet
+
+from uagents import network
+from uagents.config import ALMANAC_CONTRACT_VERSION
+from uagents.network import (
+    AlmanacContractRecord,
+    get_almanac_contract,
+    parse_record_config,
+    wait_for_tx_to_complete,
+)
+from uagents.types import AgentEndpoint
+
+TEST_ADDRESS = "agent1qtest"
+TEST_PROTOCOLS = ["foo", "bar"]
+TEST_ENDPOINTS = [AgentEndpoint(url="https://foobar.com", weight=1)]
+TEST_RECORD_RESPONSE = {
+    "record": [
+        {
+            "expiry": 1100,
+            "record": {
+                "service": {
+                    "protocols": TEST_PROTOCOLS,
+                    "endpoints": [e.model_dump() for e in TEST_ENDPOINTS],
+                }
+            },
+        }
+    ],
+    "height": 1000,
+}
+
+
+class TestParseRecordConfig(unittest.TestCase):
+    def test_parse_record_config(self):
+        self.assertIsNone(parse_record_config(None))
+        self.assertEqual(
+            parse_record_config(TEST_ADDRESS), [{"address": TEST_ADDRESS, "weight": 1}]
+        )
+        self.assertEqual(
+            parse_record_config([TEST_ADDRESS, "agent1qother"]),
+            [
+                {"address": TEST_ADDRESS, "weight": 1},
+                {"address": "agent1qother", "weight": 1},
+            ],
+        )
+        self.assertEqual(
+            parse_record_config({TEST_ADDRESS: {"weight": 3}, "agent1qother": {}}),
+            [
+                {"address": TEST_ADDRESS, "weight": 3},
+                {"address": "agent1qother", "weight": 1},
+            ],
+        )
+
+    def test_parse_record_config_returns_fresh_records(self):
+        records = parse_record_config(TEST_ADDRESS)
+        records[0]["weight"] = 5
+        self.assertEqual(
+            parse_record_config(TEST_ADDRESS), [{"address": TEST_ADDRESS, "weight": 1}]
+        )
+
+
+class TestNetworkFor(unittest.TestCase):
+    def test_network_is_cached_per_ledger(self):
+        ledger = MagicMock()
+        ledger.query_chain_id.return_value = "dorado-1"
+        self.assertEqual(network._network_for(ledger), "testnet")
+        self.assertEqual(network._network_for(ledger), "testnet")
+        ledger.query_chain_id.assert_called_once()
+
+        mainnet_ledger = MagicMock()
+        mainnet_ledger.query_chain_id.return_value = (
+            NetworkConfig.fetchai_mainnet().chain_id
+        )
+        self.assertEqual(network._network_for(mainnet_ledger), "mainnet")
+
+    def test_ledger_is_not_retained(self):
+        ledger = MagicMock()
+        ledger.query_chain_id.return_value = "dorado-1"
+        network._network_for(ledger)
+        ref = weakref.ref(ledger)
+        del ledger
+        gc.collect()
+        self.assertIsNone(ref())
+
+
+class TestWaitForTxToComplete(unittest.IsolatedAsyncioTestCase):
+    async def test_wait_for_tx_to_complete(self):
+        ledger = MagicMock()
+        ledger.query_tx.side_effect = [NotFoundError(), NotFoundError(), "tx"]
+        result = await wait_for_tx_to_complete(
+            "hash", ledger, poll_period=timedelta(milliseconds=1)
+        )
+        self.assertEqual(result, "tx")
+        self.assertEqual(ledger.query_tx.call_count, 3)
+
+    async def test_wait_for_tx_to_complete_timeout(self):
+        ledger = MagicMock()
+        ledger.query_tx.side_effect = NotFoundError()
+        with self.assertRaises(QueryTimeoutError):
+            await wait_for_tx_to_complete(
+                "hash",
+                ledger,
+                timeout=timedelta(milliseconds=20),
+                poll_period=timedelta(milliseconds=1),
+            )
+
+    async def test_wait_for_tx_to_complete_backoff(self):
+        ledger = MagicMock()
+        ledger.query_tx.side_effect = [NotFoundError()] * 5 + ["tx"]
+        with patch("uagents.network.asyncio.sleep", new=AsyncMock()) as mock_sleep:
+            await wait_for_tx_to_complete(
+                "hash", ledger, poll_period=timedelta(seconds=2)
+            )
+        delays = [call.args[0] for call in mock_sleep.await_args_list]
+        self.assertEqual(delays, [0.5, 0.75, 1.125, 1.6875, 2.0])
+
+
+class TestAlmanacContract(unittest.TestCase):
+    def setUp(self):
+        network._version_check_cache.clear()
+        self.contract = network._testnet_almanac_contract
+
+    def test_check_version_is_cached(self):
+        with patch.object(
+            self.contract, "get_contract_version", return_value=ALMANAC_CONTRACT_VERSION
+        ) as mock_version:
+            self.assertTrue(self.contract.check_version())
+            self.assertIs(get_almanac_contract(), self.contract)
+            mock_version.assert_called_once()
+
+    def test_check_version_failure_is_not_cached(self):
+        with patch.object(
+            self.contract, "get_contract_version", side_effect=RuntimeError
+        ) as mock_version:
+            self.assertFalse(self.contract.check_version())
+            self.assertFalse(self.contract.check_version())
+            self.assertEqual(mock_version.call_count, 2)
+
+    def test_get_registration_msg_endpoints(self):
+        endpoints = [
+            AgentEndpoint(url="https://foobar.com", weight=1),
+            AgentEndpoint(url="https://barbaz.com", weight=2),
+        ]
+        msg = self.contract.get_registration_msg(
+            TEST_PROTOCOLS, endpoints, "signature", 0, TEST_ADDRESS
+        )
+        dumped = msg["register"]["record"]["service"]["endpoints"]
+        self.assertEqual(dumped, [e.model_dump() for e in endpoints])
+
+        dumped[0]["weight"] = 5
+        msg = self.contract.get_registration_msg(
+            TEST_PROTOCOLS, endpoints, "signature", 0, TEST_ADDRESS
+        )
+        self.assertEqual(
+            msg["register"]["record"]["service"]["endpoints"],
+            [e.model_dump() for e in endpoints],
+        )
+
+    def test_query_contract_rejects_invalid_response(self):
+        mock_query = patch.object(self.contract, "query", return_value=None)
+        with mock_query, self.assertRaises(ValueError):
+            self.contract.query_contract({"query_contract_state": {}})
+
+    def test_registration_needs_update_single_query(self):
+        with patch.object(
+            self.contract, "query_contract", return_value=TEST_RECORD_RESPONSE
+        ) as mock_query:
+            self.assertFalse(
+                self.contract.registration_needs_update(
+                    TEST_ADDRESS, TEST_ENDPOINTS, TEST_PROTOCOLS, 100
+                )
+            )
+            mock_query.assert_called_once()
+
+    def test_query_agent_record_unregistered(self):
+        with patch.object(self.contract, "query_contract", return_value={}):
+            self.assertEqual(
+                self.contract.query_agent_record(TEST_ADDRESS), (0, [], [])
+            )
+            self.assertEqual(self.contract.get_expiry(TEST_ADDRESS), 0)
+            self.assertEqual(self.contract.get_endpoints(TEST_ADDRESS), [])
+            self.assertEqual(self.contract.get_protocols(TEST_ADDRESS), [])
+
+    def test_registration_needs_update(self):
+        with patch.object(
+            self.contract, "query_contract", return_value=TEST_RECORD_RESPONSE
+        ):
+            self.assertTrue(
+                self.contract.registration_needs_update(
+                    TEST_ADDRESS, TEST_ENDPOINTS, TEST_PROTOCOLS, 1000
+                )
+            )
+            self.assertTrue(
+                self.contract.registration_needs_update(
+                    TEST_ADDRESS, TEST_ENDPOINTS, ["baz"], 100
+                )
+            )
+        with patch.object(self.contract, "query_contract", return_value={}):
+            self.assertTrue(
+                self.contract.registration_needs_update(
+                    TEST_ADDRESS, TEST_ENDPOINTS, TEST_PROTOCOLS, 100
+                )
+            )
+
+
+class TestAlmanacContractBatch(unittest.IsolatedAsyncioTestCase):
+    async def test_register_batch_rejects_unsigned_records(self):
+        contract = network._testnet_almanac_contract
+        records = [
+            AlmanacContractRecord(
+                address=TEST_ADDRESS,
+                prefix="test-agent",
+                protocols=TEST_PROTOCOLS,
+                endpoints=TEST_ENDPOINTS,
+                contract_address=str(contract.address),
+                sender_address="fetch1sender",
+                timestamp=0,
+                signature="signature",
+            ),
+            AlmanacContractRecord(
+                address=TEST_ADDRESS,
+                prefix="test-agent",
+                protocols=TEST_PROTOCOLS,
+                endpoints=TEST_ENDPOINTS,
+                contract_address=str(contract.address),
+                sender_address="fetch1sender",
+            ),
+        ]
+        wallet = MagicMock()
+        with self.assertRaisesRegex(ValueError, r"\[1\]"):
+            await contract.register_batch(MagicMock(), wallet, records)
+        wallet.address.assert_not_called()
+
+
+class TestNameServiceContract(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        network._price_per_second_cache.clear()
+        self.contract = network._testnet_name_service_contract
+
+    @patch("uagents.network._network_for", return_value="testnet")
+    async def test_register_checks_almanac_registrations(self, _):
+        almanac_contract = MagicMock()
+        almanac_contract.is_registered.side_effect = lambda address: (
+            address == TEST_ADDRESS
+        )
+        records = [TEST_ADDRESS, "agent1qother"]
+        with (
+            patch(
+                "uagents.network.get_almanac_contract", return_value=almanac_contract
+            ),
+            patch.object(self.contract, "is_domain_public") as mock_domain,
+        ):
+            await self.contract.register(
+                MagicMock(), MagicMock(), records, "name", "agent"
+            )
+        self.assertEqual(almanac_contract.is_registered.call_count, 2)
+        mock_domain.assert_not_called()
+
+    @patch("uagents.network._network_for", return_value="testnet")
+    async def test_register_without_almanac_contract(self, _):
+        with (
+            patch("uagents.network.get_almanac_contract", return_value=None),
+            patch.object(self.contract, "is_domain_public") as mock_domain,
+        ):
+            await self.contract.register(
+                MagicMock(), MagicMock(), TEST_ADDRESS, "name", "agent"
+            )
+        mock_domain.assert_not_called()
+
+    @patch("uagents.network._network_for", return_value="testnet")
+    async def test_register_broadcasts_transaction(self, _):
+        almanac_contract = MagicMock()
+        almanac_contract.is_registered.return_value = True
+        transaction = MagicMock(tx_hash="hash")
+        ledger = MagicMock()
+        with (
+            patch(
+                "uagents.network.get_almanac_contract", return_value=almanac_contract
+            ),
+            patch.object(self.contract, "is_domain_public", return_value=True),
+            patch.object(
+                self.contract, "get_registration_tx", new=AsyncMock(return_value="tx")
+            ),
+            patch(
+                "uagents.network.prepare_and_broadcast_basic_transaction",
+                return_value=transaction,
+            ) as mock_broadcast,
+            patch(
+                "uagents.network.wait_for_tx_to_complete", new=AsyncMock()
+            ) as mock_wait,
+        ):
+            wallet = MagicMock()
+            await self.contract.register(ledger, wallet, TEST_ADDRESS, "name", "agent")
+        mock_broadcast.assert_called_once_with(ledger, "tx", wallet)
+        mock_wait.assert_awaited_once_with("hash", ledger)
+
+    async def test_unregister_executes_removal(self):
+        wallet = MagicMock()
+        with (
+            patch.object(self.contract, "is_name_available", return_value=False),
+            patch.object(self.contract, "execute") as mock_execute,
+        ):
+            await self.contract.unregister("name", "agent", wallet)
+        mock_execute.assert_called_once_with(
+            {"remove_domain": {"domain": "name.agent"}}, wallet
+        )
+        mock_execute.return_value.wait_to_complete.assert_called_once()
+
+    async def test_get_registration_tx_caches_price(self):
+        def query_contract(query_msg):
+            if "query_domain_record" in query_msg:
+                return {"is_available": True}
+            return {"price_per_second": {"amount": "100", "denom": "atestfet"}}
+
+        wallet_address = LocalWallet.generate().address()
+        with patch.object(
+            self.contract, "query_contract", side_effect=query_contract
+        ) as mock_query:
+            for _ in range(2):
+                tx = await self.contract.get_registration_tx(
+                    "name", wallet_address, TEST_ADDRESS, "agent", "testnet"
+                )
+                self.assertEqual(len(tx.msgs), 2)
+                self.assertEqual(tx.msgs[0].funds[0].amount, "8640000")
+            self.assertEqual(mock_query.call_count, 3)
+
+    async def test_get_registration_tx_owned_name(self):
+        def query_contract(query_msg):
+            if "query_domain_record" in query_msg:
+                return {"is_available": False}
+            if "permissions" in query_msg:
+                return {"permissions": "admin"}
+            raise RuntimeError("contract state unavailable")
+
+        wallet_address = LocalWallet.generate().address()
+        with patch.object(self.contract, "query_contract", side_effect=query_contract):
+            tx = await self.contract.get_registration_tx(
+                "name", wallet_address, TEST_ADDRESS, "agent", "testnet"
+            )
+        self.assertEqual(len(tx.msgs), 1)
+        self.assertIn(b"update_record", tx.msgs[0].msg)
+
+    async def test_get_registration_tx_price_failure(self):
+        def query_contract(query_msg):
+            if "query_domain_record" in query_msg:
+                return {"is_available": True}
+            raise RuntimeError("contract state unavailable")
+
+        wallet_address = LocalWallet.generate().address()
+        mock_query = patch.object(
+            self.contract, "query_contract", side_effect=query_contract
+        )
+        with mock_query, self.assertRaises(RuntimeError):
+            await self.contract.get_registration_tx(
+                "name", wallet_address, TEST_ADDRESS, "agent", "testnet"
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()